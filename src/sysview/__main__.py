@@ -1,27 +1,295 @@
 """
 Main application module for sysview
 """
+from __future__ import annotations
+import os
 import time
 import signal
 import sys
-import msvcrt
-from rich.live import Live
-from rich.console import Console
-from rich.layout import Layout
-from rich.panel import Panel
-from rich.text import Text
+import threading
+import queue
+import ctypes
+
+# Платформа не меняется на лету - проверяем один раз при импорте
+_IS_WINDOWS = sys.platform == 'win32'
+from dataclasses import dataclass
+import numpy as np
+try:
+    from numba import njit
+except ImportError:  # Numba опционален - остаёмся на чистом NumPy
+    njit = None
 import click
 
 from .system import SystemStats
-from .config import config
-from .draw import Drawer
-from .themes import THEMES
+from .config import config, VISIBLE_ROWS
+from .themes import get_themes
+from .theme_loader import ThemeLoader
+
+def _import_rich():
+    """Deferred Rich imports - `sysview --help` doesn't pay the import cost"""
+    global Console, Layout, Panel, Style
+    from rich.console import Console
+    from rich.layout import Layout
+    from rich.panel import Panel
+    from rich.style import Style
+
+def _topk_by_key(cpu_arr, mem_arr, k, key_is_cpu):
+    """Return indices of the k largest entries, sorted descending by key"""
+    values = cpu_arr if key_is_cpu else mem_arr
+    if k >= values.shape[0]:
+        return np.argsort(-values)
+    # Частичная сортировка: O(N) выбор + сортировка только k элементов
+    idx = np.argpartition(-values, k)[:k]
+    return idx[np.argsort(-values[idx])]
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _topk_jit(values, k):
+        # Мин-куча размера k по значению - один проход по массиву
+        n = values.shape[0]
+        heap_val = np.empty(k, np.float32)
+        heap_idx = np.empty(k, np.int64)
+        size = 0
+        for i in range(n):
+            v = values[i]
+            if size < k:
+                # Просеивание вверх
+                j = size
+                heap_val[j] = v
+                heap_idx[j] = i
+                size += 1
+                while j > 0:
+                    parent = (j - 1) // 2
+                    if heap_val[parent] <= heap_val[j]:
+                        break
+                    heap_val[parent], heap_val[j] = heap_val[j], heap_val[parent]
+                    heap_idx[parent], heap_idx[j] = heap_idx[j], heap_idx[parent]
+                    j = parent
+            elif v > heap_val[0]:
+                # Замена корня и просеивание вниз
+                heap_val[0] = v
+                heap_idx[0] = i
+                j = 0
+                while True:
+                    left = 2 * j + 1
+                    right = left + 1
+                    smallest = j
+                    if left < k and heap_val[left] < heap_val[smallest]:
+                        smallest = left
+                    if right < k and heap_val[right] < heap_val[smallest]:
+                        smallest = right
+                    if smallest == j:
+                        break
+                    heap_val[smallest], heap_val[j] = heap_val[j], heap_val[smallest]
+                    heap_idx[smallest], heap_idx[j] = heap_idx[j], heap_idx[smallest]
+                    j = smallest
+        order = np.argsort(-heap_val[:size])
+        return heap_idx[:size][order]
+
+    def _topk_by_key(cpu_arr, mem_arr, k, key_is_cpu):  # noqa: F811
+        """Return indices of the k largest entries, sorted descending by key"""
+        values = cpu_arr if key_is_cpu else mem_arr
+        if k >= values.shape[0]:
+            return np.argsort(-values)
+        return _topk_jit(values, k)
+
+# Статичные тексты интерфейса (собираются в панели один раз при старте)
+_HELP_TEXT = """
+Горячие клавиши:
+q: Выход
+h: Показать/скрыть справку
+m: Показать/скрыть меню
+p: Поставить/возобновить паузу
+s: Сортировать процессы
+f: Фильтровать процессы
+1-5: Переключение layout'ов
+"""
+
+_MENU_TEXT = """
+Меню:
+1. Изменить тему
+2. Настроить графики
+3. Настроить обновление
+4. Настроить фильтры
+"""
+
+_KEYS_HELP_STR = " | ".join([
+    "q:Quit",
+    "h:Help",
+    "m:Menu",
+    "p:Pause",
+    "s:Sort",
+    "f:Filter"
+])
+
+# Константы консольного ввода Windows
+_STD_INPUT_HANDLE = -10
+_KEY_EVENT = 0x0001
+_VK_SCROLL = {
+    0x26: -1,   # VK_UP
+    0x28: 1,    # VK_DOWN
+    0x21: -10,  # VK_PRIOR (Page Up)
+    0x22: 10,   # VK_NEXT (Page Down)
+}
+
+class _CHAR_UNION(ctypes.Union):
+    _fields_ = [("UnicodeChar", ctypes.c_wchar),
+                ("AsciiChar", ctypes.c_char)]
+
+class _KEY_EVENT_RECORD(ctypes.Structure):
+    _fields_ = [("bKeyDown", ctypes.c_int),
+                ("wRepeatCount", ctypes.c_ushort),
+                ("wVirtualKeyCode", ctypes.c_ushort),
+                ("wVirtualScanCode", ctypes.c_ushort),
+                ("uChar", _CHAR_UNION),
+                ("dwControlKeyState", ctypes.c_uint)]
+
+class _EVENT_UNION(ctypes.Union):
+    _fields_ = [("KeyEvent", _KEY_EVENT_RECORD),
+                ("_padding", ctypes.c_byte * 16)]
+
+class _INPUT_RECORD(ctypes.Structure):
+    _fields_ = [("EventType", ctypes.c_ushort),
+                ("Event", _EVENT_UNION)]
+
+class KeyThread(threading.Thread):
+    """Thread that blocks on ReadConsoleInputW and queues decoded keys"""
+    def __init__(self, app):
+        super().__init__(daemon=True)
+        self.app = app
+
+    def run(self):
+        kernel32 = ctypes.windll.kernel32  # только Windows - см. start_key_thread
+        h_stdin = kernel32.GetStdHandle(_STD_INPUT_HANDLE)
+        record = _INPUT_RECORD()
+        n_read = ctypes.c_uint(0)
+        while self.app.running:
+            if not kernel32.ReadConsoleInputW(h_stdin, ctypes.byref(record), 1,
+                                              ctypes.byref(n_read)):
+                break
+            if record.EventType != _KEY_EVENT:
+                continue
+            key_event = record.Event.KeyEvent
+            if not key_event.bKeyDown:
+                continue
+            delta = _VK_SCROLL.get(key_event.wVirtualKeyCode)
+            if delta is not None:
+                self.app.keys.put(('scroll', delta))
+            elif key_event.uChar.UnicodeChar:
+                self.app.keys.put(('char', key_event.uChar.UnicodeChar.lower()))
+
+class PosixKeyThread(threading.Thread):
+    """Thread reading raw stdin on POSIX and queueing decoded keys"""
+
+    # Escape-последовательности стрелок и PgUp/PgDn -> шаг прокрутки
+    _ESC_SCROLL = {'[A': -1, '[B': 1, '[5~': -10, '[6~': 10}
+
+    # Приводим POSIX-коды к тем, что отдаёт msvcrt и ждёт _dispatch_key:
+    # Enter в cbreak приходит как '\n', Backspace - как DEL
+    _KEY_MAP = {'\n': '\r', '\x7f': '\x08'}
+
+    def __init__(self, app):
+        super().__init__(daemon=True)
+        self.app = app
+
+    def run(self):
+        import select
+        import termios
+        import tty
+        try:
+            fd = sys.stdin.fileno()
+            old_attrs = termios.tcgetattr(fd)
+        except (ValueError, OSError, termios.error):
+            return  # stdin не терминал - работаем без клавиатуры
+        try:
+            tty.setcbreak(fd)
+            while self.app.running:
+                # Таймаут, чтобы поток замечал app.running = False
+                if not select.select([fd], [], [], 0.25)[0]:
+                    continue
+                ch = os.read(fd, 1).decode('utf-8', 'ignore')
+                if ch == '\x1b':
+                    # Дочитываем возможную escape-последовательность
+                    seq = ''
+                    while len(seq) < 3 and select.select([fd], [], [], 0.01)[0]:
+                        seq += os.read(fd, 1).decode('utf-8', 'ignore')
+                        if seq in self._ESC_SCROLL:
+                            break
+                    delta = self._ESC_SCROLL.get(seq)
+                    if delta is not None:
+                        self.app.keys.put(('scroll', delta))
+                    elif not seq:
+                        self.app.keys.put(('char', '\x1b'))
+                elif ch:
+                    self.app.keys.put(('char', self._KEY_MAP.get(ch, ch.lower())))
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+
+def start_key_thread(app):
+    """Start the keyboard reader suited to the current platform"""
+    thread = KeyThread(app) if _IS_WINDOWS else PosixKeyThread(app)
+    thread.start()
+    return thread
+
+class StatsWorker(threading.Thread):
+    """Background thread refreshing stats snapshots off the render thread"""
+    def __init__(self, app, interval: float):
+        super().__init__(daemon=True)
+        self.app = app
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            if not self.app.paused:
+                self.app.refresh_stats()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        """Signal the worker to exit"""
+        self._stop_event.set()
+
+@dataclass
+class Overlay:
+    """Active overlay panel shown on top of the main layout"""
+    # Ручной __slots__ вместо dataclass(slots=True), чтобы не поднимать
+    # минимальный Python до 3.10
+    __slots__ = ('panel', 'type', 'time')
+    panel: Panel
+    type: str
+    time: float
 
 class SysView:
+    __slots__ = (
+        'console', 'stats', 'theme', '_style_header', '_style_footer',
+        '_style_text', '_style_border', '_style_highlight', 'drawer', 'layout',
+        'running', 'paused', 'current_layout', 'overlay', 'process_sort_key',
+        'process_sort_reverse', 'process_filter', '_filter_lower',
+        'filter_buffer', 'selected_process', 'overlay_time', 'overlay_duration',
+        'process_scroll', 'keys', '_help_panel', '_menu_panel', '_panel_cache',
+        'cached_stats', '_last_fp', '_disk_ts'
+    )
+
     def __init__(self, theme="default"):
+        _import_rich()
+        from .draw import Drawer  # тянет за собой rich - тоже откладываем
         self.console = Console()
         self.stats = SystemStats(config)
-        self.theme = THEMES.get(theme, THEMES["default"])
+        # Пользовательская .theme-тема перекрывает встроенные; файл
+        # читается только если тема с таким именем действительно выбрана
+        loader = ThemeLoader()
+        user_theme = loader.get_theme(theme)
+        if user_theme is not None:
+            self.theme = loader.convert_to_rich_theme(user_theme)
+        else:
+            themes = get_themes()
+            self.theme = themes.get(theme, themes["default"])
+        # Разбираем стили темы один раз, а не на каждую панель
+        self._style_header = Style.parse(self.theme["header"])
+        self._style_footer = Style.parse(self.theme["footer"])
+        self._style_text = Style.parse(self.theme["text"])
+        self._style_border = self.theme["border"]
+        self._style_highlight = self.theme["highlight"]
         self.drawer = Drawer(config, self.theme)
         self.layout = Layout()
         self.running = True
@@ -31,11 +299,27 @@ class SysView:
         self.process_sort_key = 'cpu_percent'
         self.process_sort_reverse = True
         self.process_filter = ''
+        self._filter_lower = None  # Фильтр в нижнем регистре (вычисляется при применении)
         self.filter_buffer = ''
         self.selected_process = None
         self.overlay_time = 0
         self.overlay_duration = 3
         self.process_scroll = 0  # Текущая позиция прокрутки
+        self.keys = queue.Queue()  # Очередь событий клавиатуры от KeyThread
+        # Статичные панели создаём один раз, а не на каждое нажатие
+        self._help_panel = Panel(
+            _HELP_TEXT.strip(),
+            title="[bold cyan]Справка[/bold cyan]",
+            border_style="cyan"
+        )
+        self._menu_panel = Panel(
+            _MENU_TEXT.strip(),
+            title="[bold cyan]Меню[/bold cyan]",
+            border_style="cyan"
+        )
+        self._panel_cache = {}  # Кэш отрисованных панелей (ключ - идентичность статистики)
+        self._last_fp = None  # Отпечаток последнего отрисованного состояния
+        self._disk_ts = 0.0  # Время последнего опроса дисков
         self.cached_stats = {
             'cpu': None,
             'memory': None,
@@ -72,57 +356,58 @@ class SysView:
         )
         
         # Применяем стили темы
-        self.layout["header"].style = self.theme["header"]
-        self.layout["footer"].style = self.theme["footer"]
-        self.layout["cpu"].style = self.theme["text"]
-        self.layout["memory"].style = self.theme["text"]
-        self.layout["network"].style = self.theme["text"]
-        self.layout["disks"].style = self.theme["text"]
-        self.layout["processes"].style = self.theme["text"]
+        self.layout["header"].style = self._style_header
+        self.layout["footer"].style = self._style_footer
+        self.layout["cpu"].style = self._style_text
+        self.layout["memory"].style = self._style_text
+        self.layout["network"].style = self._style_text
+        self.layout["disks"].style = self._style_text
+        self.layout["processes"].style = self._style_text
         
     def handle_keyboard(self):
-        """Handle keyboard input when available"""
-        if msvcrt.kbhit():
-            try:
-                key = msvcrt.getch()
-                if key == b'\xe0':  # Специальная клавиша
-                    key = msvcrt.getch()
-                    if key == b'H':  # Стрелка вверх
-                        self.scroll_processes(-1)
-                    elif key == b'P':  # Стрелка вниз
-                        self.scroll_processes(1)
-                    elif key == b'I':  # Page Up
-                        self.scroll_processes(-10)
-                    elif key == b'Q':  # Page Down
-                        self.scroll_processes(10)
+        """Dispatch key events queued by KeyThread (non-blocking)"""
+        try:
+            while True:
+                kind, value = self.keys.get_nowait()
+                self._dispatch_key(kind, value)
+        except queue.Empty:
+            pass
+
+    # Таблица диспетчеризации: клавиша -> имя метода
+    _ACTIONS = {
+        'q': 'quit',
+        'p': 'toggle_pause',
+        'h': 'toggle_help',
+        'm': 'toggle_menu',
+        's': 'toggle_sort',
+        'f': 'toggle_process_filter',
+    }
+
+    def _dispatch_key(self, kind: str, value):
+        """Handle a single decoded key event"""
+        try:
+            if kind == 'scroll':
+                self.scroll_processes(value)
+                return
+            key = value
+            action = self._ACTIONS.get(key)
+            if action is not None:
+                getattr(self, action)()
+            elif '1' <= key <= '5':
+                self.change_layout(ord(key) - 48)
+            elif self.overlay and self.overlay.type == 'filter':
+                if key == '\r':  # Enter
+                    self.process_filter = self.filter_buffer
+                    self._filter_lower = self.filter_buffer.lower() or None
+                    self.overlay = None
+                elif key == '\x1b':  # Escape
+                    self.overlay = None
+                elif key == '\x08':  # Backspace
+                    self.filter_buffer = self.filter_buffer[:-1]
                 else:
-                    key = key.decode('utf-8').lower()
-                    if key == 'q':
-                        self.running = False
-                    elif key == 'p':
-                        self.toggle_pause()
-                    elif key == 'h':
-                        self.toggle_help()
-                    elif key == 'm':
-                        self.toggle_menu()
-                    elif key == 's':
-                        self.toggle_sort()
-                    elif key == 'f':
-                        self.toggle_process_filter()
-                    elif key in '12345':
-                        self.change_layout(int(key))
-                    elif self.overlay and self.overlay['type'] == 'filter':
-                        if key == '\r':  # Enter
-                            self.process_filter = self.filter_buffer
-                            self.overlay = None
-                        elif key == '\x1b':  # Escape
-                            self.overlay = None
-                        elif key == '\x08':  # Backspace
-                            self.filter_buffer = self.filter_buffer[:-1]
-                        else:
-                            self.filter_buffer += key
-            except Exception:
-                pass
+                    self.filter_buffer += key
+        except Exception:
+            pass
 
     def scroll_processes(self, delta: int):
         """Scroll process list by delta amount"""
@@ -134,34 +419,17 @@ class SysView:
         
     def toggle_help(self):
         """Toggle help overlay"""
-        if self.overlay and self.overlay['type'] == 'help':
+        if self.overlay and self.overlay.type == 'help':
             self.overlay = None
         else:
-            help_text = """
-            Горячие клавиши:
-            q: Выход
-            h: Показать/скрыть справку
-            m: Показать/скрыть меню
-            p: Поставить/возобновить паузу
-            s: Сортировать процессы
-            f: Фильтровать процессы
-            1-5: Переключение layout'ов
-            """
-            self.show_overlay("Справка", help_text, 'help')
-        
+            self.overlay = Overlay(self._help_panel, 'help', time.time())
+
     def toggle_menu(self):
         """Toggle menu overlay"""
-        if self.overlay and self.overlay['type'] == 'menu':
+        if self.overlay and self.overlay.type == 'menu':
             self.overlay = None
         else:
-            menu_text = """
-            Меню:
-            1. Изменить тему
-            2. Настроить графики
-            3. Настроить обновление
-            4. Настроить фильтры
-            """
-            self.show_overlay("Меню", menu_text, 'menu')
+            self.overlay = Overlay(self._menu_panel, 'menu', time.time())
         
     def toggle_pause(self):
         """Toggle pause state"""
@@ -176,7 +444,7 @@ class SysView:
 
     def toggle_process_filter(self):
         """Toggle process filter input"""
-        if self.overlay and self.overlay['type'] == 'filter':
+        if self.overlay and self.overlay.type == 'filter':
             self.overlay = None
         else:
             filter_text = """
@@ -190,15 +458,15 @@ class SysView:
 
     def show_overlay(self, title: str, content: str, overlay_type: str):
         """Show an overlay panel"""
-        self.overlay = {
-            'panel': Panel(
+        self.overlay = Overlay(
+            Panel(
                 content.strip(),
                 title=f"[bold cyan]{title}[/bold cyan]",
                 border_style="cyan"
             ),
-            'type': overlay_type,
-            'time': time.time()
-        }
+            overlay_type,
+            time.time()
+        )
 
     def change_layout(self, layout_num: int):
         """Change current layout preset"""
@@ -208,42 +476,73 @@ class SysView:
             # Apply layout configuration
             pass
 
+    def refresh_stats(self):
+        """Collect a fresh stats snapshot (runs on the StatsWorker thread)"""
+        # Атомарная подмена словаря - читатели блокировок не требуют
+        stats = self.stats
+        # Диски меняются медленно, а их опрос - самый дорогой: раз в 5 секунд
+        now = time.monotonic()
+        if now - self._disk_ts >= 5.0 or self.cached_stats['disk'] is None:
+            disk = stats.get_disk_stats()
+            self._disk_ts = now
+        else:
+            disk = self.cached_stats['disk']
+        self.cached_stats = {
+            'cpu': stats.get_cpu_stats(),
+            'memory': stats.get_memory_stats(),
+            'disk': disk,
+            'network': stats.get_network_stats(),
+            'processes': stats.get_process_stats(),
+            'system': stats.get_system_info(),
+            'battery': stats.get_battery_info()
+        }
+
     def update(self):
         """Update the display"""
-        # Получаем или используем кэшированные данные
-        if not self.paused:
-            self.cached_stats.update({
-                'cpu': self.stats.get_cpu_stats(),
-                'memory': self.stats.get_memory_stats(),
-                'disk': self.stats.get_disk_stats(),
-                'network': self.stats.get_network_stats(),
-                'processes': self.stats.get_process_stats(),
-                'system': self.stats.get_system_info(),
-                'battery': self.stats.get_battery_info()
-            })
-
-        # Используем кэшированные данные
+        # Если ни данные, ни состояние интерфейса не менялись - отдаём
+        # прошлый layout без какой-либо работы Rich (пауза почти бесплатна).
+        # В отпечатке хранятся сами снимки, а не их id: ссылка удерживает
+        # объект живым, и сравнение `is` не даст ложного совпадения от
+        # переиспользования адреса освобождённого снимка
+        snaps = tuple(self.cached_stats.values())
+        ui_state = (self.paused, self.process_scroll, self.process_filter,
+                    self.process_sort_key)
+        last = self._last_fp
+        stats_fingerprint = (snaps, ui_state)
+        if (last is not None and not self.overlay and last[1] == ui_state
+                and all(a is b for a, b in zip(last[0], snaps))):
+            return self.layout
+
+        # Используем кэшированные данные, собранные фоновым потоком
         cpu_stats = self.cached_stats['cpu']
         mem_stats = self.cached_stats['memory']
         disk_stats = self.cached_stats['disk']
         net_stats = self.cached_stats['network']
-        proc_stats = self.cached_stats['processes']
+        proc_snap = self.cached_stats['processes']
         sys_info = self.cached_stats['system']
         battery = self.cached_stats['battery']
 
-        # Update layout sections
-        self.layout["header"].update(
-            Panel(
-                f"SysView - {sys_info['hostname']} - Uptime: {int(sys_info['uptime'] // 3600)}h {int((sys_info['uptime'] % 3600) // 60)}m" +
-                (" [bold red](PAUSED)[/]" if self.paused else ""),
-                style=self.theme["header"]
+        cache = self._panel_cache
+
+        # Update layout sections (панели пересоздаются только при изменении данных)
+        # Локальные привязки горячих значений - меньше словарных обращений
+        hostname = sys_info['hostname']
+        uptime_minutes = int(sys_info['uptime']) // 60
+        header_key = (hostname, uptime_minutes, self.paused)
+        if cache.get('header_key') != header_key:
+            hours, minutes = divmod(uptime_minutes, 60)
+            paused_suffix = " [bold red](PAUSED)[/]" if self.paused else ""
+            cache['header'] = Panel(
+                f"SysView - {hostname} - Uptime: {hours}h {minutes}m{paused_suffix}",
+                style=self._style_header
             )
-        )
+            cache['header_key'] = header_key
+        self.layout["header"].update(cache['header'])
 
         # Если есть активный оверлей, показываем его поверх основного контента
         if self.overlay:
-            if self.overlay['type'] == 'filter':
-                self.overlay['panel'] = Panel(
+            if self.overlay.type == 'filter':
+                self.overlay.panel = Panel(
                     f"""
                     Enter process filter:
                     (current: {self.filter_buffer or 'none'})
@@ -251,57 +550,77 @@ class SysView:
                     Press Enter to apply
                     Press Esc to cancel
                     """.strip(),
-                    title=f"[{self.theme['highlight']}]Filter Processes: {self.filter_buffer}[/]",
-                    border_style=self.theme['border']
+                    title=f"[{self._style_highlight}]Filter Processes: {self.filter_buffer}[/]",
+                    border_style=self._style_border
                 )
-            return self.overlay['panel']
+            return self.overlay.panel
 
-        self.layout["cpu"].update(
-            self.drawer.draw_cpu(cpu_stats)
-        )
+        if cache.get('cpu_id') is not cpu_stats:
+            cache['cpu'] = self.drawer.draw_cpu(cpu_stats)
+            cache['cpu_id'] = cpu_stats
+        self.layout["cpu"].update(cache['cpu'])
 
-        self.layout["memory"].update(
-            self.drawer.draw_memory(mem_stats)
-        )
+        if cache.get('memory_id') is not mem_stats:
+            cache['memory'] = self.drawer.draw_memory(mem_stats)
+            cache['memory_id'] = mem_stats
+        self.layout["memory"].update(cache['memory'])
 
-        self.layout["network"].update(
-            self.drawer.draw_network(net_stats)
-        )
+        if cache.get('network_id') is not net_stats:
+            cache['network'] = self.drawer.draw_network(net_stats)
+            cache['network_id'] = net_stats
+        self.layout["network"].update(cache['network'])
 
-        self.layout["disks"].update(
-            self.drawer.draw_disks(disk_stats)
-        )
+        if cache.get('disks_id') is not disk_stats:
+            cache['disks'] = self.drawer.draw_disks(disk_stats)
+            cache['disks_id'] = disk_stats
+        self.layout["disks"].update(cache['disks'])
 
-        # Фильтруем и сортируем процессы
-        if self.process_filter:
-            proc_stats = [p for p in proc_stats if self.process_filter.lower() in p['name'].lower()]
-        
-        self.layout["processes"].update(
-            self.drawer.draw_processes(proc_stats, self.process_scroll)
-        )
+        # Процессы зависят ещё от фильтра, сортировки и прокрутки;
+        # снимок сравнивается по идентичности (как и у других секций)
+        # и удерживается ссылкой в кэше
+        processes_key = (self.process_filter, self.process_sort_key,
+                         self.process_scroll)
+        if (cache.get('processes_id') is not proc_snap
+                or cache.get('processes_key') != processes_key):
+            proc_stats = proc_snap.procs
+            cpu_arr, mem_arr = proc_snap.cpu, proc_snap.mem
+            # Векторный фильтр по предвычисленной колонке имён
+            if self._filter_lower:
+                matches = np.nonzero(
+                    np.char.find(proc_snap.name_lower, self._filter_lower) >= 0)[0]
+                proc_stats = [proc_stats[i] for i in matches]
+                cpu_arr, mem_arr = cpu_arr[matches], mem_arr[matches]
+            # Отбираем только видимое окно top-k вместо полной сортировки
+            total_procs = len(proc_stats)
+            k = self.process_scroll + VISIBLE_ROWS
+            if total_procs > k:
+                idx = _topk_by_key(cpu_arr, mem_arr, k,
+                                   self.process_sort_key == 'cpu_percent')
+                proc_stats = [proc_stats[i] for i in idx]
+            cache['processes'] = self.drawer.draw_processes(
+                proc_stats, self.process_scroll, total_procs=total_procs,
+                sort_key=self.process_sort_key)
+            cache['processes_id'] = proc_snap
+            cache['processes_key'] = processes_key
+        self.layout["processes"].update(cache['processes'])
 
-        if battery:
-            battery_text = f"🔋 {battery['percent']}% {'🔌' if battery['power_plugged'] else ''}"
-        else:
-            battery_text = ""
-
-        # Добавляем информацию о горячих клавишах в футер
-        keys_help = [
-            "q:Quit",
-            "h:Help",
-            "m:Menu",
-            "p:Pause",
-            "s:Sort",
-            "f:Filter"
-        ]
-        
-        self.layout["footer"].update(
-            Panel(
-                f"{battery_text} | {' | '.join(keys_help)}",
-                style=self.theme["footer"]
+        bat_pct = battery['percent'] if battery else None
+        bat_plugged = battery['power_plugged'] if battery else None
+        footer_key = (bat_pct, bat_plugged)
+        if cache.get('footer_key') != footer_key:
+            if battery:
+                battery_text = f"🔋 {bat_pct}% {'🔌' if bat_plugged else ''}"
+            else:
+                battery_text = ""
+
+            cache['footer'] = Panel(
+                f"{battery_text} | {_KEYS_HELP_STR}",
+                style=self._style_footer
             )
-        )
+            cache['footer_key'] = footer_key
+        self.layout["footer"].update(cache['footer'])
 
+        self._last_fp = stats_fingerprint
         return self.layout
 
 @click.command()
@@ -313,20 +632,32 @@ def main(interval: float, theme: str):
         app.running = False
     
     signal.signal(signal.SIGINT, signal_handler)
-    
+
+    from rich.live import Live
+
     config.set("color_theme", theme)
     app = SysView(theme)
-    
+    app.refresh_stats()  # Первый снимок собираем синхронно
+    worker = StatsWorker(app, config.get("update_ms", 1500) / 1000)
+    worker.start()
+    start_key_thread(app)
+
     with Live(
         app.update(),
-        refresh_per_second=1/interval,
+        auto_refresh=False,  # Рендерим только из главного цикла
         screen=True,  # Use alternate screen
         transient=True  # Prevent flickering
     ) as live:
+        # Монотонный дедлайн - кадры не дрейфуют от накопления sleep
+        next_frame = time.monotonic()
         while app.running:
             app.handle_keyboard()  # Обработка клавиатуры
-            live.update(app.update())
-            time.sleep(interval)
+            live.update(app.update(), refresh=True)
+            next_frame += interval
+            time.sleep(max(0, next_frame - time.monotonic()))
+
+    worker.stop()
+    worker.join(timeout=1.0)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -2,7 +2,17 @@
 Configuration module for sysview
 """
 from pathlib import Path
+import atexit
 import json
+import threading
+try:
+    import orjson
+except ImportError:  # orjson опционален - запасной вариант на stdlib json
+    orjson = None
+
+# Число строк процессов, видимых в панели: общее для отбора top-k в
+# главном цикле и для окна прокрутки в отрисовщике
+VISIBLE_ROWS = 30
 
 DEFAULT_CONFIG = {
     "color_theme": "default",
@@ -62,36 +72,52 @@ class Config:
         self.config_dir = Path.home() / ".config" / "sysview"
         self.config_file = self.config_dir / "sysview.conf"
         self.config = DEFAULT_CONFIG.copy()
+        self._dirty = False
+        self._flush_timer = None
         self._load_config()
+        atexit.register(self._flush)
 
     def _load_config(self):
         """Load configuration from file"""
-        if not self.config_dir.exists():
-            self.config_dir.mkdir(parents=True)
-        
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, "r") as f:
-                    loaded_config = json.load(f)
-                    self.config.update(loaded_config)
-            except Exception:
-                self.save_config()
-        else:
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            data = self.config_file.read_bytes()
+            self.config.update(
+                orjson.loads(data) if orjson is not None else json.loads(data))
+        except FileNotFoundError:
+            self.save_config()
+        except Exception:
             self.save_config()
 
     def save_config(self):
         """Save current configuration to file"""
-        with open(self.config_file, "w") as f:
-            json.dump(self.config, f, indent=4)
+        if orjson is not None:
+            self.config_file.write_bytes(
+                orjson.dumps(self.config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.config_file, "w") as f:
+                json.dump(self.config, f, indent=4)
+
+    def _flush(self):
+        """Write pending changes to disk"""
+        self._flush_timer = None
+        if self._dirty:
+            self._dirty = False
+            self.save_config()
 
     def get(self, key, default=None):
         """Get configuration value"""
         return self.config.get(key, default)
 
     def set(self, key, value):
-        """Set configuration value and save"""
+        """Set configuration value and schedule a debounced save"""
         if key in self.config:
             self.config[key] = value
-            self.save_config()
+            self._dirty = True
+            # Откладываем запись, чтобы не писать на диск на каждое нажатие
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(1.0, self._flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
 
 config = Config() 
\ No newline at end of file
@@ -7,9 +7,100 @@ from rich.table import Table
 from rich.panel import Panel
 from rich import box
 from rich.text import Text
-from typing import List, Dict, Union, Optional
+from typing import List, Dict, Tuple, Union, Optional
+import bisect
+import functools
+import heapq
+import operator
+import numpy as np
 import time
 
+from .config import VISIBLE_ROWS
+try:
+    from numba import njit
+except ImportError:  # Numba опционален - остаётся векторный NumPy-путь
+    njit = None
+
+if njit is not None:
+    @njit(cache=True)
+    def _graph_indices(values, width, height, max_val):
+        """Compiled kernel: map samples to a (height, width) 0/1 cell grid"""
+        out = np.empty((height, width), np.uint8)
+        inv = height / max_val
+        for x in range(width):
+            v = min(height - 1, int(values[x] * inv))
+            for y in range(height):
+                out[height - 1 - y, x] = 1 if v >= y else 0
+        return out
+
+    @njit(cache=True)
+    def _render_graph(values, width, height, max_val, full_cp, empty_cp):
+        """Compiled kernel: render the whole graph as UTF-32 code points"""
+        # Нормализация, пороги и сборка строк в один проход; перевод строки
+        # (код 10) вставляется между рядами, итог декодируется как utf-32-le
+        out = np.empty(height * (width + 1) - 1, np.uint32)
+        inv = height / max_val
+        pos = 0
+        for y in range(height - 1, -1, -1):
+            for x in range(width):
+                v = min(height - 1, int(values[x] * inv))
+                out[pos] = full_cp if v >= y else empty_cp
+                pos += 1
+            if y > 0:
+                out[pos] = 10
+                pos += 1
+        return out
+else:
+    _graph_indices = None
+    _render_graph = None
+
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+@functools.lru_cache(maxsize=256)
+def _format_bytes_cached(n: int) -> str:
+    """Format a byte count using bit_length-based unit selection"""
+    # Номер единицы = позиция старшего бита // 10 - без цикла и делений
+    unit = min((max(n, 1).bit_length() - 1) // 10, 5)
+    return f"{n / (1 << (unit * 10)):.1f}{_BYTE_UNITS[unit]}"
+
+@functools.lru_cache(maxsize=4096)
+def _format_int_cached(n: int) -> str:
+    """Cache thousands-separated integers: totals rarely change per frame"""
+    return f"{n:,}"
+
+@functools.lru_cache(maxsize=256)
+def _format_size_cached(n: int, base10: bool) -> str:
+    """Format a size honoring the base_10_sizes setting"""
+    if not base10:
+        unit = min((max(n, 1).bit_length() - 1) // 10, 5)
+        return f"{n / (1 << (unit * 10)):.1f} {_BYTE_UNITS[unit]}"
+    size = float(n)
+    for unit in _BYTE_UNITS:
+        if size < 1000:
+            return f"{size:.1f} {unit}"
+        size /= 1000
+    return f"{size:.1f} {_BYTE_UNITS[-1]}"
+
+# Общие объекты стилей - создаются один раз вместо Style(...) на каждую строку
+_GREEN = Style(color="green")
+_YELLOW = Style(color="yellow")
+_RED = Style(color="red")
+_BLUE = Style(color="blue")
+
+# Пороговые таблицы: выбор стиля через bisect вместо цепочек тернарников.
+# bisect_left сохраняет семантику строгого "value > порог".
+_PCT_CUTS = (60, 80)
+_PCT_STYLES = (_GREEN, _YELLOW, _RED)
+_LOAD_CUTS = (70, 90)
+_LOAD_STYLES = (_GREEN, _YELLOW, _RED)
+_CORE_STYLES = (_BLUE, _YELLOW, _RED)
+_SWAP_CUTS = (25, 50)
+_SWAP_STYLES = (_BLUE, _YELLOW, _RED)
+_SPEED_CUTS = (1024 * 1024, 1024 * 1024 * 10)
+_SPEED_STYLES = (_GREEN, _YELLOW, _RED)
+# Пороги подсветки значений CPU%/MEM% в таблице процессов
+_PROC_VALUE_CUTS = (20, 50)
+
 class Drawer:
     BRAILLE_CHARS = [
         '⠀', '⠁', '⠂', '⠃', '⠄', '⠅', '⠆', '⠇',
@@ -35,18 +126,66 @@ class Drawer:
         }
         self.graph_width = 50
         self.graph_history = {}
+        # Таблица стилей значений процессов в порядке возрастания порога
+        self._value_styles = (theme['progress_low'], theme['progress_medium'],
+                              theme['progress_high'])
+        # psutil отдаёт статусы уже в нижнем регистре - словарь строится
+        # один раз, в цикле остаётся только dict.get
+        self._status_styles = {
+            'running': theme['progress_low'],
+            'sleeping': theme['cpu'],
+            'stopped': theme['progress_high'],
+            'zombie': theme['progress_high'],
+            'disk-sleep': theme['progress_medium'],
+            'tracing-stop': theme['progress_medium'],
+        }
+        self._default_status_style = theme['text']
+        # Набор символов графика не меняется между кадрами - кэшируем его
+        # и не ходим в config на каждую перерисовку
+        self._refresh_graph_chars()
+        # Шаблоны таблиц: колонки определяются один раз, на кадр очищаются
+        # только строки - меньше Rich-объектов на каждую перерисовку
+        self._cpu_table = Table(box=box.SIMPLE, expand=True, show_header=False)
+        self._cpu_table.add_column("Name")
+        self._cpu_table.add_column("Usage", justify="right")
+        self._cpu_table.add_column("Bar")
+        self._mem_table = Table(box=box.SIMPLE, expand=True, show_header=False)
+        self._mem_table.add_column("Type")
+        self._mem_table.add_column("Usage", justify="right")
+        self._mem_table.add_column("Bar")
+        self._net_table = Table(box=box.SIMPLE, expand=True, show_header=False)
+        self._net_table.add_column("Type", width=12)
+        self._net_table.add_column("Current", justify="right")
+        self._net_table.add_column("Total", justify="right")
+        self._net_table.add_column("Packets", justify="right")
+        self._disk_table = Table(box=box.SIMPLE, expand=True)
+        self._disk_table.add_column("Drive")
+        self._disk_table.add_column("Label")
+        self._disk_table.add_column("Type", justify="center")
+        self._disk_table.add_column("Usage", justify="right")
+        self._disk_table.add_column("Free", justify="right")
+        self._disk_table.add_column("Total", justify="right")
+        self._proc_table = Table(box=box.SIMPLE, expand=True)
+        self._proc_table.add_column("PID", justify="right", style="dim")
+        self._proc_table.add_column("Name", width=30)
+        self._proc_table.add_column("CPU%", justify="right")
+        self._proc_table.add_column("MEM%", justify="right")
+        self._proc_table.add_column("Status", width=10)
+        self._proc_table.add_column("Threads", justify="right", width=8)
+
+    @staticmethod
+    def _reset_rows(table: Table) -> Table:
+        """Clear a template table's rows, keeping its column definitions"""
+        table.rows.clear()
+        for column in table.columns:
+            column._cells.clear()
+        return table
 
     def _format_bytes(self, bytes: Optional[int]) -> str:
         """Format bytes to human readable format"""
         if bytes is None:
             return "N/A"
-            
-        bytes = float(bytes)
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes < 1024:
-                return f"{bytes:.1f}{unit}"
-            bytes /= 1024
-        return f"{bytes:.1f}PB"
+        return _format_bytes_cached(int(bytes))
         
     def _format_speed(self, bytes_per_sec: float) -> str:
         """Format network speed"""
@@ -64,57 +203,84 @@ class Drawer:
 
     def create_progress_bar(self, value: float, total: float = 100, width: int = 25) -> ProgressBar:
         """Create a styled progress bar"""
-        style = Style(color="red" if value > 80 else "yellow" if value > 60 else "green")
+        style = _PCT_STYLES[bisect.bisect_left(_PCT_CUTS, value)]
         return ProgressBar(value, total, width=width, style=style)
 
-    def create_graph(self, values: List[float], width: int = 30, height: int = 8) -> List[str]:
-        """Create a graph using braille, block or tty characters"""
-        graph_type = self.config.get("graph_symbol", "braille")
-        chars = self.graph_chars[graph_type]
-        
-        if not values:
-            return [" " * width] * height
+    def _refresh_graph_chars(self):
+        """Re-read the graph symbol set from config (call after config changes)"""
+        self._graph_type = self.config.get("graph_symbol", "braille")
+        chars = self.graph_chars[self._graph_type]
+        self._empty_char = chars[0]
+        self._full_char = chars[-1]
+        self._chars_arr = np.array([chars[0], chars[-1]], dtype='U1')
+
+    @staticmethod
+    def _graph_values(values, width: int) -> Optional[Tuple[np.ndarray, float]]:
+        """Normalize history to a (width,) array; None if empty or flat"""
+        if len(values) == 0:
+            return None
 
-        # Convert deque to list and get the last 'width' values
-        values_list = list(values)
-        if len(values_list) > width:
-            values_list = values_list[-width:]
+        # Берём последние 'width' значений одним срезом
+        arr = np.asarray(values, dtype=np.float32)
+        if arr.shape[0] > width:
+            arr = arr[-width:]
 
-        # Normalize values to height
-        max_val = max(values_list)
+        max_val = float(arr.max())
         if max_val == 0:
-            return [" " * width] * height
+            return None
 
         # Pad with zeros if not enough values
-        if len(values_list) < width:
-            values_list = [0] * (width - len(values_list)) + values_list
+        if arr.shape[0] < width:
+            arr = np.pad(arr, (width - arr.shape[0], 0))
+        return arr, max_val
 
-        # Create the graph
-        normalized = [min(height - 1, int((v / max_val) * height)) for v in values_list]
-        
-        graph = []
-        for y in range(height - 1, -1, -1):
-            line = ""
-            for x in range(width):
-                val = normalized[x]
-                if val >= y:
-                    line += chars[-1]
-                else:
-                    line += chars[0]
-            graph.append(line)
+    def _graph_cells(self, values, width: int, height: int) -> Optional[np.ndarray]:
+        """Build the (height, width) character-cell matrix, None if graph is flat"""
+        prepared = self._graph_values(values, width)
+        if prepared is None:
+            return None
+        arr, max_val = prepared
+
+        if _graph_indices is not None:
+            # Скомпилированное ядро возвращает индексы символов
+            idx = _graph_indices(arr, width, height, max_val)
+            return self._chars_arr[idx]
 
-        return graph
+        # Векторная маска вместо вложенного цикла width*height
+        normalized = np.minimum(height - 1, (arr * (height / max_val)).astype(np.int64))
+        ys = np.arange(height - 1, -1, -1).reshape(-1, 1)
+        mask = normalized.reshape(1, -1) >= ys
+        return np.where(mask, self._full_char, self._empty_char)
+
+    def create_graph(self, values: List[float], width: int = 30, height: int = 8) -> List[str]:
+        """Create a graph using braille, block or tty characters"""
+        cells = self._graph_cells(values, width, height)
+        if cells is None:
+            return [" " * width] * height
+        return [''.join(row) for row in cells]
+
+    def create_graph_text(self, values, width: int = 30, height: int = 8) -> str:
+        """Create a graph as a single newline-joined string"""
+        if _render_graph is not None:
+            prepared = self._graph_values(values, width)
+            if prepared is None:
+                return "\n".join([" " * width] * height)
+            arr, max_val = prepared
+            # Одно скомпилированное ядро и одна аллокация на весь график
+            cps = _render_graph(arr, width, height, max_val,
+                                ord(self._full_char), ord(self._empty_char))
+            return cps.tobytes().decode('utf-32-le')
+
+        cells = self._graph_cells(values, width, height)
+        if cells is None:
+            return "\n".join([" " * width] * height)
+        # Строки собираются одним view вместо join по каждой строке
+        rows = np.ascontiguousarray(cells).view(f'U{width}').ravel()
+        return "\n".join(rows.tolist())
 
     def format_size(self, size: float) -> str:
         """Format size in bytes to human readable format"""
-        base = 1000 if self.config.get("base_10_sizes") else 1024
-        units = ['B', 'KB', 'MB', 'GB', 'TB', 'PB']
-        
-        for unit in units:
-            if size < base:
-                return f"{size:.1f} {unit}"
-            size /= base
-        return f"{size:.1f} {units[-1]}"
+        return _format_size_cached(int(size), bool(self.config.get("base_10_sizes")))
 
     def draw_cpu(self, stats: Dict) -> Panel:
         """Draw CPU section with history graph"""
@@ -124,42 +290,39 @@ class Drawer:
         layout.add_column("graph", ratio=3)
         
         # Колонка с информацией
-        cpu_table = Table(box=box.SIMPLE, expand=True, show_header=False)
-        cpu_table.add_column("Name")
-        cpu_table.add_column("Usage", justify="right")
-        cpu_table.add_column("Bar")
-        
+        cpu_table = self._reset_rows(self._cpu_table)
+
         # Total CPU
-        progress = ProgressBar(total=100, completed=stats['total'], 
-                             style="red" if stats['total'] > 90 else "yellow" if stats['total'] > 70 else "green")
+        progress = ProgressBar(total=100, completed=stats['total'],
+                             style=_LOAD_STYLES[bisect.bisect_left(_LOAD_CUTS, stats['total'])])
         cpu_table.add_row("Total CPU", f"{stats['total']}%", progress)
-        
+
         # Per CPU cores
         for i, usage in enumerate(stats['per_cpu']):
-            progress = ProgressBar(total=100, completed=usage, 
-                                 style="red" if usage > 90 else "yellow" if usage > 70 else "blue")
+            progress = ProgressBar(total=100, completed=usage,
+                                 style=_CORE_STYLES[bisect.bisect_left(_LOAD_CUTS, usage)])
             cpu_table.add_row(f"Core {i}", f"{usage}%", progress)
         
         # Колонка с графиком
-        history_graph = self.create_graph(stats['history'], width=50, height=10)
-        graph = "\n".join(history_graph)
-        
+        graph = self.create_graph_text(stats['history'], width=50, height=10)
+
         # Добавляем информацию и график в layout
         layout.add_row(cpu_table, Text(graph))
         
         # Добавляем информацию о частоте и температуре
         info_text = []
         if stats.get('freq_current'):
-            info_text.append(f"Frequency: {stats['freq_current']:.1f}MHz")
+            info_text.append(Text(f"Frequency: {stats['freq_current']:.1f}MHz"))
         if stats.get('temp'):
             temp = stats['temp']
-            temp_style = "red" if temp > 80 else "yellow" if temp > 60 else "green"
-            info_text.append(f"Temperature: [{temp_style}]{temp}°C[/]")
-        
+            temp_style = _PCT_STYLES[bisect.bisect_left(_PCT_CUTS, temp)]
+            info_text.append(
+                Text("Temperature: ") + Text(f"{temp}°C", style=temp_style))
+
         return Panel(
             layout,
             title="[bold blue]CPU[/bold blue]",
-            subtitle=" | ".join(info_text) if info_text else None,
+            subtitle=Text(" | ").join(info_text) if info_text else None,
             border_style="blue"
         )
         
@@ -170,15 +333,12 @@ class Drawer:
         layout.add_column("graph", ratio=3)
         
         # Колонка с информацией
-        mem_table = Table(box=box.SIMPLE, expand=True, show_header=False)
-        mem_table.add_column("Type")
-        mem_table.add_column("Usage", justify="right")
-        mem_table.add_column("Bar")
-        
+        mem_table = self._reset_rows(self._mem_table)
+
         # RAM с детальной информацией
         ram_text = f"{self._format_bytes(stats['used'])} / {self._format_bytes(stats['total'])}"
         ram_progress = ProgressBar(total=100, completed=stats['percent'],
-                                 style="red" if stats['percent'] > 90 else "yellow" if stats['percent'] > 70 else "green")
+                                 style=_LOAD_STYLES[bisect.bisect_left(_LOAD_CUTS, stats['percent'])])
         mem_table.add_row("RAM", ram_text, ram_progress)
         
         # Добавляем детальную информацию о памяти
@@ -198,15 +358,14 @@ class Drawer:
         if stats['swap_total'] > 0:
             swap_text = f"{self._format_bytes(stats['swap_used'])} / {self._format_bytes(stats['swap_total'])}"
             swap_progress = ProgressBar(total=100, completed=stats['swap_percent'],
-                                      style="red" if stats['swap_percent'] > 50 else "yellow" if stats['swap_percent'] > 25 else "blue")
+                                      style=_SWAP_STYLES[bisect.bisect_left(_SWAP_CUTS, stats['swap_percent'])])
             mem_table.add_row("Swap", swap_text, swap_progress)
             swap_free = f"Free: {self._format_bytes(stats['swap_total'] - stats['swap_used'])}"
             mem_table.add_row("", swap_free, "")
         
         # График использования памяти
-        history_graph = self.create_graph(stats['history'], width=50, height=8)
         graph_panel = Panel(
-            Text("\n".join(history_graph)),
+            Text(self.create_graph_text(stats['history'], width=50, height=8)),
             title="[blue]Memory Usage History[/blue]",
             border_style="blue"
         )
@@ -228,30 +387,26 @@ class Drawer:
         layout.add_column("graph", ratio=3)
         
         # Колонка с информацией
-        net_table = Table(box=box.SIMPLE, expand=True, show_header=False)
-        net_table.add_column("Type", width=12)
-        net_table.add_column("Current", justify="right")
-        net_table.add_column("Total", justify="right")
-        net_table.add_column("Packets", justify="right")
-        
+        net_table = self._reset_rows(self._net_table)
+
         # Upload statistics
         up_speed = stats['send_speed']
-        up_style = "red" if up_speed > 1024*1024*10 else "yellow" if up_speed > 1024*1024 else "green"
+        up_style = _SPEED_STYLES[bisect.bisect_left(_SPEED_CUTS, up_speed)]
         net_table.add_row(
             "[bold green]Upload ↑[/]",
-            f"[{up_style}]{self._format_speed(up_speed)}[/]",
+            Text(self._format_speed(up_speed), style=up_style),
             self._format_bytes(stats['bytes_sent']),
-            f"{stats['packets_sent']:,}"
+            _format_int_cached(stats['packets_sent'])
         )
         
         # Download statistics
         down_speed = stats['recv_speed']
-        down_style = "red" if down_speed > 1024*1024*10 else "yellow" if down_speed > 1024*1024 else "green"
+        down_style = _SPEED_STYLES[bisect.bisect_left(_SPEED_CUTS, down_speed)]
         net_table.add_row(
             "[bold blue]Download ↓[/]",
-            f"[{down_style}]{self._format_speed(down_speed)}[/]",
+            Text(self._format_speed(down_speed), style=down_style),
             self._format_bytes(stats['bytes_recv']),
-            f"{stats['packets_recv']:,}"
+            _format_int_cached(stats['packets_recv'])
         )
         
         # Добавляем информацию о пиковых скоростях
@@ -268,22 +423,20 @@ class Drawer:
                 "", ""
             )
         
-        # Создаем графики для загрузки и скачивания
-        upload_history = [x[0] for x in stats['history']]
-        download_history = [x[1] for x in stats['history']]
-        
+        # Графики загрузки и скачивания: готовые срезы SoA-буфера без копий
+        upload_history = stats['history_up']
+        download_history = stats['history_down']
+
         # График загрузки
-        up_graph = self.create_graph(upload_history, width=50, height=4)
         up_panel = Panel(
-            Text("\n".join(up_graph)),
+            Text(self.create_graph_text(upload_history, width=50, height=4)),
             title="[green]Upload History[/green]",
             border_style="green"
         )
         
         # График скачивания
-        down_graph = self.create_graph(download_history, width=50, height=4)
         down_panel = Panel(
-            Text("\n".join(down_graph)),
+            Text(self.create_graph_text(download_history, width=50, height=4)),
             title="[blue]Download History[/blue]",
             border_style="blue"
         )
@@ -308,20 +461,14 @@ class Drawer:
         
     def draw_disks(self, stats: List[Dict]) -> Panel:
         """Draw disks section"""
-        disk_table = Table(box=box.SIMPLE, expand=True)
-        disk_table.add_column("Drive")
-        disk_table.add_column("Label")
-        disk_table.add_column("Type", justify="center")
-        disk_table.add_column("Usage", justify="right")
-        disk_table.add_column("Free", justify="right")
-        disk_table.add_column("Total", justify="right")
-        
+        disk_table = self._reset_rows(self._disk_table)
+
         for disk in stats:
             # Создаем прогресс-бар для использования
             progress = ProgressBar(
                 total=100,
                 completed=disk['percent'],
-                style="red" if disk['percent'] > 90 else "yellow" if disk['percent'] > 70 else "green"
+                style=_LOAD_STYLES[bisect.bisect_left(_LOAD_CUTS, disk['percent'])]
             )
             
             # Получаем тип диска и его цвет
@@ -350,69 +497,67 @@ class Drawer:
             border_style="yellow"
         )
         
-    def draw_processes(self, stats: List[Dict], scroll_position: int = 0) -> Panel:
-        """Draw processes section with scrolling support"""
-        proc_table = Table(box=box.SIMPLE, expand=True)
-        proc_table.add_column("PID", justify="right", style="dim")
-        proc_table.add_column("Name", width=30)
-        proc_table.add_column("CPU%", justify="right")
-        proc_table.add_column("MEM%", justify="right")
-        proc_table.add_column("Status", width=10)
-        proc_table.add_column("Threads", justify="right", width=8)
-        
-        # Sort by CPU usage
-        sorted_procs = sorted(stats, key=lambda x: x['cpu_percent'], reverse=True)
-        
+    def draw_processes(self, stats: List[Dict], scroll_position: int = 0,
+                       total_procs: Optional[int] = None,
+                       sort_key: str = 'cpu_percent') -> Panel:
+        """Draw processes section with scrolling support
+
+        total_procs - полное число процессов до усечения списка до
+        видимого окна (по умолчанию - длина переданного списка);
+        sort_key - поле сортировки, то же, что у отбора top-k.
+        """
+        proc_table = self._reset_rows(self._proc_table)
+
+        # Сортировка по выбранному ключу: нужны только первые
+        # scroll+VISIBLE_ROWS строк, поэтому частичный top-k через кучу;
+        # полная сортировка - лишь когда окно покрывает больше половины
+        by_key = operator.itemgetter(sort_key)
+        k = scroll_position + VISIBLE_ROWS
+        if k < len(stats) / 2:
+            sorted_procs = heapq.nlargest(k, stats, key=by_key)
+        else:
+            sorted_procs = sorted(stats, key=by_key, reverse=True)
+
         # Calculate visible range based on scroll position
         start_idx = scroll_position
-        end_idx = min(start_idx + 30, len(sorted_procs))
-        
+        end_idx = min(start_idx + VISIBLE_ROWS, len(sorted_procs))
+
         # Adjust scroll position if needed
         if start_idx >= len(sorted_procs):
-            start_idx = max(0, len(sorted_procs) - 30)
+            start_idx = max(0, len(sorted_procs) - VISIBLE_ROWS)
             end_idx = len(sorted_procs)
-        
+
+        # Связываем поиск ключей один раз перед горячим циклом
+        get_row = operator.itemgetter(
+            'pid', 'name', 'cpu_percent', 'memory_percent', 'status')
+        status_styles = self._status_styles
+        default_status_style = self._default_status_style
+        value_styles = self._value_styles
+        add_row = proc_table.add_row
+
         for proc in sorted_procs[start_idx:end_idx]:
-            status_style = {
-                'running': self.theme['progress_low'],
-                'sleeping': self.theme['cpu'],
-                'stopped': self.theme['progress_high'],
-                'zombie': self.theme['progress_high'],
-                'disk-sleep': self.theme['progress_medium'],
-                'tracing-stop': self.theme['progress_medium'],
-            }.get(proc['status'].lower(), self.theme['text'])
-            
+            pid, name, cpu_value, mem_value, status = get_row(proc)
+            status_style = status_styles.get(status, default_status_style)
+
             # Форматируем имя процесса
-            name = proc['name']
             if len(name) > 30:
                 name = name[:27] + "..."
-            
+
             # Определяем стиль для значений CPU и Memory
-            cpu_value = proc['cpu_percent']
-            mem_value = proc['memory_percent']
-            
-            cpu_style = (
-                self.theme['progress_high'] if cpu_value > 50 else
-                self.theme['progress_medium'] if cpu_value > 20 else
-                self.theme['progress_low']
-            )
-            
-            mem_style = (
-                self.theme['progress_high'] if mem_value > 50 else
-                self.theme['progress_medium'] if mem_value > 20 else
-                self.theme['progress_low']
-            )
-            
-            proc_table.add_row(
-                str(proc['pid']),
+            cpu_style = value_styles[bisect.bisect_left(_PROC_VALUE_CUTS, cpu_value)]
+            mem_style = value_styles[bisect.bisect_left(_PROC_VALUE_CUTS, mem_value)]
+
+            add_row(
+                str(pid),
                 name,
-                f"[{cpu_style}]{cpu_value:.1f}[/]",
-                f"[{mem_style}]{mem_value:.1f}[/]",
-                Text(proc['status'], style=status_style),
+                Text(f"{cpu_value:.1f}", style=cpu_style),
+                Text(f"{mem_value:.1f}", style=mem_style),
+                Text(status, style=status_style),
                 str(proc.get('num_threads', 'N/A'))
             )
         
-        total_procs = len(sorted_procs)
+        if total_procs is None:
+            total_procs = len(stats)
         shown_range = f"{start_idx + 1}-{end_idx}"
         
         return Panel(
@@ -1,32 +1,118 @@
 """
 System information gathering module
 """
+import os
 import psutil
 import time
+import numpy as np
 from typing import Dict, List, Optional, Tuple
-from collections import deque
+from collections import namedtuple
 import platform
 
+# Платформа не меняется на лету - проверяем один раз при импорте
+_IS_WINDOWS = platform.system() == 'Windows'
+_IS_LINUX = platform.system() == 'Linux'
+if _IS_WINDOWS:
+    import ctypes
+    import string
+if _IS_LINUX:
+    _CLK_TCK = os.sysconf('SC_CLK_TCK')
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+# Коды состояний из /proc/<pid>/stat -> канонические имена psutil
+_PROC_STATES = {
+    b'R': 'running',
+    b'S': 'sleeping',
+    b'D': 'disk-sleep',
+    b'T': 'stopped',
+    b't': 'tracing-stop',
+    b'Z': 'zombie',
+    b'X': 'dead',
+    b'x': 'dead',
+    b'I': 'idle',
+    b'W': 'waking',
+    b'P': 'parked',
+}
+
+# Длина хранимой истории для графиков
+GRAPH_WIDTH = 100
+
+# Типы дисков Windows (коды GetDriveTypeW)
+_DRIVE_TYPES = {
+    0: "Unknown",
+    1: "Invalid",
+    2: "Removable",
+    3: "Fixed",
+    4: "Network",
+    5: "CDROM",
+    6: "RAM disk"
+}
+
+# SoA-снимок процессов: список строк для отрисовки плюс колонки-массивы
+# для векторного фильтра и частичной сортировки
+ProcSnapshot = namedtuple('ProcSnapshot', ['procs', 'pid', 'name_lower', 'cpu', 'mem'])
+
 class SystemStats:
     def __init__(self, config):
         self.config = config
-        self.cpu_history = deque(maxlen=100)
-        self.memory_history = deque(maxlen=100)
-        self.net_history = deque(maxlen=100)
+        # Кольцевые буферы истории: запись O(1) без реаллокаций
+        self._cpu_hist = np.zeros(GRAPH_WIDTH, dtype=np.float32)
+        self._cpu_idx = 0
+        self._cpu_len = 0
+        self._mem_hist = np.zeros(GRAPH_WIDTH, dtype=np.float32)
+        self._mem_idx = 0
+        self._mem_len = 0
+        self._net_hist = np.zeros((2, GRAPH_WIDTH), dtype=np.float32)
+        self._net_idx = 0
+        self._net_len = 0
         self.last_net_io = None
         self.last_disk_io = {}
+        # Кэш разделов (раз в несколько секунд) и типов дисков (на всё время)
+        self._partitions_cache = (0.0, None)
+        self._drive_type_cache = {}
         self.last_cpu_percent = None
-        self.process_cpu_history = {}
+        # PID -> (psutil.Process, запись с данными); статичные поля заполняются
+        # один раз при появлении процесса, летучие обновляются каждый тик
+        self._proc_cache = {}
+        if _IS_LINUX:
+            # Быстрый путь через /proc: дельты тиков CPU между кадрами
+            self._linux_proc_cache = {}
+            self._prev_proc_times = {}
+            self._prev_proc_ts = time.monotonic()
+            self._total_mem = psutil.virtual_memory().total
         self.prev_net_io = psutil.net_io_counters()
         self.prev_time = time.time()
         self.peak_send_speed = 0
         self.peak_recv_speed = 0
         self.update_interval = 1.0  # seconds
+        # Прогрев неблокирующего cpu_percent: дальше каждый вызов с
+        # interval=None возвращает дельту с прошлого вызова (первый кадр - 0%)
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+
+    @staticmethod
+    def _ring_view(buf: np.ndarray, idx: int, length: int) -> np.ndarray:
+        """Return ring-buffer samples in chronological order (always a copy)"""
+        if length < buf.shape[-1]:
+            # Копия, а не срез-представление: иначе снимок в cached_stats
+            # менялся бы задним числом при следующих записях в буфер
+            return buf[..., :length].copy()
+        return np.concatenate((buf[..., idx:], buf[..., :idx]), axis=-1)
+
+    def _get_partitions(self):
+        """Return disk partitions, re-enumerated at most every 5 seconds"""
+        ts, parts = self._partitions_cache
+        now = time.time()
+        if parts is None or now - ts > 5.0:
+            parts = psutil.disk_partitions(all=True)
+            self._partitions_cache = (now, parts)
+        return parts
 
     def get_cpu_stats(self) -> Dict:
         """Get CPU statistics"""
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        per_cpu = psutil.cpu_percent(interval=0.1, percpu=True)
+        # Неблокирующая форма: без interval=0.1 нет 200 мс сна на кадр
+        cpu_percent = psutil.cpu_percent(interval=None)
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
         
         try:
             freq = psutil.cpu_freq()
@@ -49,8 +135,10 @@ class SystemStats:
             except Exception:
                 pass
 
-        self.cpu_history.append(cpu_percent)
-        
+        self._cpu_hist[self._cpu_idx] = cpu_percent
+        self._cpu_idx = (self._cpu_idx + 1) % GRAPH_WIDTH
+        self._cpu_len = min(self._cpu_len + 1, GRAPH_WIDTH)
+
         return {
             'total': cpu_percent,
             'per_cpu': per_cpu,
@@ -58,7 +146,7 @@ class SystemStats:
             'freq_min': freq_min,
             'freq_max': freq_max,
             'temp': temp,
-            'history': list(self.cpu_history)
+            'history': self._ring_view(self._cpu_hist, self._cpu_idx, self._cpu_len)
         }
 
     def get_memory_stats(self) -> Dict:
@@ -67,10 +155,11 @@ class SystemStats:
         swap = psutil.swap_memory()
         
         # Добавляем значение в историю
-        self.memory_history.append(mem.percent)
-        if len(self.memory_history) > 100:
-            self.memory_history.pop(0)
-            
+        self._mem_hist[self._mem_idx] = mem.percent
+        self._mem_idx = (self._mem_idx + 1) % GRAPH_WIDTH
+        self._mem_len = min(self._mem_len + 1, GRAPH_WIDTH)
+
+
         return {
             'total': mem.total,
             'available': mem.available,
@@ -83,21 +172,33 @@ class SystemStats:
             'swap_used': swap.used,
             'swap_free': swap.free,
             'swap_percent': swap.percent,
-            'history': self.memory_history
+            'history': self._ring_view(self._mem_hist, self._mem_idx, self._mem_len)
         }
 
     def get_disk_stats(self) -> List[Dict]:
         """Get disk statistics"""
         disks = []
-        
-        if platform.system() == 'Windows':
-            # Получаем все доступные буквы дисков в Windows
-            import string
-            import ctypes
-            
+
+        # Счётчики I/O снимаем один раз на весь проход
+        try:
+            io_counters = psutil.disk_io_counters(perdisk=True)
+        except Exception:
+            io_counters = {}
+
+        if _IS_WINDOWS:
             # Получаем битовую маску подключенных дисков
             bitmask = ctypes.windll.kernel32.GetLogicalDrives()
-            
+
+            # Метки строим один раз из кэшированных разделов
+            mount_by_letter = {}
+            try:
+                for part in self._get_partitions():
+                    letter = part.device[:1]
+                    if letter not in mount_by_letter:
+                        mount_by_letter[letter] = part.mountpoint
+            except Exception:
+                pass
+
             # Проверяем каждую букву диска
             for letter in string.ascii_uppercase:
                 if bitmask & (1 << (ord(letter) - ord('A'))):
@@ -105,32 +206,16 @@ class SystemStats:
                     try:
                         # Проверяем, готов ли диск
                         usage = psutil.disk_usage(drive)
-                        
-                        # Получаем тип диска
-                        drive_type = ctypes.windll.kernel32.GetDriveTypeW(drive)
-                        drive_types = {
-                            0: "Unknown",
-                            1: "Invalid",
-                            2: "Removable",
-                            3: "Fixed",
-                            4: "Network",
-                            5: "CDROM",
-                            6: "RAM disk"
-                        }
-                        drive_type_str = drive_types.get(drive_type, "Unknown")
-                        
-                        # Получаем метку диска
-                        try:
-                            volume_info = psutil.disk_partitions(all=True)
-                            for part in volume_info:
-                                if part.device.startswith(drive[0]):
-                                    label = part.mountpoint
-                                    break
-                            else:
-                                label = f"Disk {letter}"
-                        except:
-                            label = f"Disk {letter}"
-                        
+
+                        # Тип диска меняется редко - мемоизируем на время работы
+                        drive_type_str = self._drive_type_cache.get(drive)
+                        if drive_type_str is None:
+                            drive_type = ctypes.windll.kernel32.GetDriveTypeW(drive)
+                            drive_type_str = _DRIVE_TYPES.get(drive_type, "Unknown")
+                            self._drive_type_cache[drive] = drive_type_str
+
+                        label = mount_by_letter.get(letter, f"Disk {letter}")
+
                         disk_data = {
                             'device': drive,
                             'mountpoint': drive,
@@ -142,31 +227,27 @@ class SystemStats:
                             'free': usage.free,
                             'percent': usage.percent
                         }
-                        
+
                         # Получаем информацию о I/O
-                        try:
-                            io = psutil.disk_io_counters(perdisk=True)
-                            for disk_name, disk_io in io.items():
-                                if disk_name.lower().startswith(letter.lower()):
-                                    disk_data.update({
-                                        'read_bytes': disk_io.read_bytes,
-                                        'write_bytes': disk_io.write_bytes,
-                                        'read_count': disk_io.read_count,
-                                        'write_count': disk_io.write_count
-                                    })
-                                    break
-                        except:
-                            pass
+                        for disk_name, disk_io in io_counters.items():
+                            if disk_name.lower().startswith(letter.lower()):
+                                disk_data.update({
+                                    'read_bytes': disk_io.read_bytes,
+                                    'write_bytes': disk_io.write_bytes,
+                                    'read_count': disk_io.read_count,
+                                    'write_count': disk_io.write_count
+                                })
+                                break
 
                         disks.append(disk_data)
                     except:
                         continue
         else:
             # Linux/Unix логика
-            for partition in psutil.disk_partitions(all=True):
+            for partition in self._get_partitions():
                 try:
                     usage = psutil.disk_usage(partition.mountpoint)
-                    
+
                     disk_data = {
                         'device': partition.device,
                         'mountpoint': partition.mountpoint,
@@ -179,18 +260,14 @@ class SystemStats:
                         'percent': usage.percent
                     }
 
-                    try:
-                        io = psutil.disk_io_counters(perdisk=True)
-                        device_name = partition.device.split('/')[-1]
-                        if device_name in io:
-                            disk_data.update({
-                                'read_bytes': io[device_name].read_bytes,
-                                'write_bytes': io[device_name].write_bytes,
-                                'read_count': io[device_name].read_count,
-                                'write_count': io[device_name].write_count
-                            })
-                    except:
-                        pass
+                    device_name = partition.device.split('/')[-1]
+                    if device_name in io_counters:
+                        disk_data.update({
+                            'read_bytes': io_counters[device_name].read_bytes,
+                            'write_bytes': io_counters[device_name].write_bytes,
+                            'read_count': io_counters[device_name].read_count,
+                            'write_count': io_counters[device_name].write_count
+                        })
 
                     disks.append(disk_data)
                 except:
@@ -216,14 +293,17 @@ class SystemStats:
         self.peak_recv_speed = max(self.peak_recv_speed, recv_speed)
         
         # Добавляем значения в историю
-        self.net_history.append((send_speed, recv_speed))
-        if len(self.net_history) > 100:
-            self.net_history.pop(0)
-            
+        self._net_hist[:, self._net_idx] = (send_speed, recv_speed)
+        self._net_idx = (self._net_idx + 1) % GRAPH_WIDTH
+        self._net_len = min(self._net_len + 1, GRAPH_WIDTH)
+
+
         # Сохраняем значения для следующего вычисления
         self.prev_net_io = current_net_io
         self.prev_time = current_time
-        
+
+        net_hist = self._ring_view(self._net_hist, self._net_idx, self._net_len)
+
         return {
             'bytes_sent': current_net_io.bytes_sent,
             'bytes_recv': current_net_io.bytes_recv,
@@ -233,52 +313,153 @@ class SystemStats:
             'recv_speed': recv_speed,
             'peak_send_speed': self.peak_send_speed,
             'peak_recv_speed': self.peak_recv_speed,
-            'history': list(self.net_history)
+            # SoA: строки (2, N) режутся на отправку/приём без копирования
+            'history_up': net_hist[0],
+            'history_down': net_hist[1]
         }
 
-    def get_process_stats(self) -> List[Dict]:
-        """Get process statistics"""
+    def get_process_stats(self) -> ProcSnapshot:
+        """Get process statistics (incremental: static fields cached per PID)"""
+        if _IS_LINUX:
+            processes = self._get_processes_linux()
+        else:
+            processes = self._get_processes_psutil()
+
+        n = len(processes)
+        return ProcSnapshot(
+            procs=processes,
+            pid=np.fromiter((p['pid'] for p in processes), dtype=np.int64, count=n),
+            name_lower=np.array([p['name_lower'] for p in processes], dtype=np.str_),
+            cpu=np.fromiter((p['cpu_percent'] or 0.0 for p in processes),
+                            dtype=np.float32, count=n),
+            mem=np.fromiter((p['memory_percent'] or 0.0 for p in processes),
+                            dtype=np.float32, count=n)
+        )
+
+    def _get_processes_linux(self) -> List[Dict]:
+        """Fast process listing via /proc, avoiding psutil per-process overhead"""
+        now = time.monotonic()
+        time_delta = now - self._prev_proc_ts
+        self._prev_proc_ts = now
+        # Проценты CPU считаем из дельты utime+stime между кадрами
+        cpu_scale = 100.0 / (_CLK_TCK * time_delta) if time_delta > 0 else 0.0
+        mem_scale = 100.0 * _PAGE_SIZE / self._total_mem
+        prev_times = self._prev_proc_times
+        new_times = {}
+        cache = self._linux_proc_cache
         processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 
-                                       'create_time', 'status', 'num_threads']):
+
+        for dirent in os.scandir('/proc'):
+            pid_str = dirent.name
+            if not pid_str.isdigit():
+                continue
             try:
-                pinfo = proc.info
-                pid = pinfo['pid']
-                
-                # Update CPU history for process
-                if pid not in self.process_cpu_history:
-                    self.process_cpu_history[pid] = deque(maxlen=10)
-                self.process_cpu_history[pid].append(pinfo['cpu_percent'])
-                
-                pinfo['cpu_history'] = list(self.process_cpu_history[pid])
-                
-                # Get memory info
-                try:
-                    mem_info = proc.memory_info()
-                    pinfo['memory_rss'] = mem_info.rss
-                    pinfo['memory_vms'] = mem_info.vms
-                except Exception:
-                    pinfo['memory_rss'] = 0
-                    pinfo['memory_vms'] = 0
-                
-                # Get command line
-                try:
-                    pinfo['cmdline'] = ' '.join(proc.cmdline())
-                except Exception:
-                    pinfo['cmdline'] = ''
-                
-                processes.append(pinfo)
+                with open(f'/proc/{pid_str}/stat', 'rb') as f:
+                    data = f.read()
+            except OSError:
+                # Процесс успел завершиться между scandir и чтением
+                continue
+
+            # Имя в скобках может содержать пробелы и скобки - режем
+            # по последней ')' и берём поля справа от неё
+            rpar = data.rfind(b')')
+            if rpar < 0:
+                continue
+            fields = data[rpar + 2:].split()
+            pid = int(pid_str)
+            ticks = int(fields[11]) + int(fields[12])  # utime + stime
+            new_times[pid] = ticks
+
+            static = cache.get(pid)
+            if static is None:
+                name = data[data.find(b'(') + 1:rpar].decode('utf-8', 'replace')
+                # Предвычисленное имя в нижнем регистре для фильтра
+                static = (name, name.lower())
+                cache[pid] = static
+
+            # Строка снимка собирается заново на каждом кадре: кэш хранит
+            # только статические поля, поэтому поток отрисовки может
+            # спокойно держать предыдущий снимок - его словари больше
+            # никто не перезаписывает
+            prev = prev_times.get(pid)
+            processes.append({
+                'pid': pid,
+                'name': static[0],
+                'name_lower': static[1],
+                'cpu_percent': (ticks - prev) * cpu_scale if prev is not None else 0.0,
+                'memory_percent': int(fields[21]) * mem_scale,  # rss в страницах
+                'status': _PROC_STATES.get(fields[0], 'unknown'),
+                'num_threads': int(fields[17]),
+            })
+
+        # Вычищаем умершие PID из кэшей
+        for pid in cache.keys() - new_times.keys():
+            del cache[pid]
+        self._prev_proc_times = new_times
+        return processes
+
+    def _get_processes_psutil(self) -> List[Dict]:
+        """Portable process listing via psutil (Windows/macOS)"""
+        live_pids = set(psutil.pids())
+        cache = self._proc_cache
+
+        # Записи создаём только для новых процессов
+        for pid in live_pids - cache.keys():
+            try:
+                proc = psutil.Process(pid)
+                # oneshot() собирает атрибуты процесса за один системный вызов
+                with proc.oneshot():
+                    name = proc.name()
+                    proc.cpu_percent(interval=None)  # прогрев
+                # Предвычисленное имя в нижнем регистре для фильтра
+                cache[pid] = (proc, name, name.lower())
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 continue
-            
-        # Clean up process history for dead processes
-        current_pids = {p['pid'] for p in processes}
-        dead_pids = set(self.process_cpu_history.keys()) - current_pids
-        for pid in dead_pids:
-            del self.process_cpu_history[pid]
-            
+
+        # Убираем умершие процессы из кэша
+        for pid in cache.keys() - live_pids:
+            del cache[pid]
+
+        processes = []
+        for pid, (proc, name, name_lower) in list(cache.items()):
+            try:
+                # Строка снимка собирается заново на каждом кадре: кэш
+                # хранит только статические поля, чтобы не перезаписывать
+                # словари снимка, который сейчас рисует другой поток
+                with proc.oneshot():
+                    processes.append({
+                        'pid': pid,
+                        'name': name,
+                        'name_lower': name_lower,
+                        'cpu_percent': proc.cpu_percent(interval=None),
+                        'memory_percent': proc.memory_percent(),
+                        'status': proc.status(),
+                        'num_threads': proc.num_threads(),
+                    })
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                del cache[pid]
+                continue
+
         return processes
 
+    def get_process_detail(self, pid: int) -> Optional[Dict]:
+        """Get expensive per-process details on demand (process selection)"""
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                mem_info = proc.memory_info()
+                return {
+                    'pid': pid,
+                    'name': proc.name(),
+                    'username': proc.username(),
+                    'create_time': proc.create_time(),
+                    'memory_rss': mem_info.rss,
+                    'memory_vms': mem_info.vms,
+                    'cmdline': ' '.join(proc.cmdline())
+                }
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
     def get_system_info(self) -> Dict:
         """Get general system information"""
         boot_time = psutil.boot_time()
@@ -0,0 +1,240 @@
+"""
+User theme loading for sysview
+"""
+import concurrent.futures
+import configparser
+import functools
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .themes import _canon_color
+
+# Быстрый разбор .theme: формат - плоский INI без интерполяции и
+# многострочных значений, двух регулярных выражений достаточно
+# Жадный .+ обязателен: имена секций вида 'theme[main]' сами содержат ']'
+_SECTION_RE = re.compile(r'^\[(.+)\]\s*$', re.M)
+_KV_RE = re.compile(r'^\s*([^=;#\s][^=]*?)\s*=\s*(.*?)\s*$', re.M)
+
+# Ключи плоской карты стилей в порядке значений _build_rich_theme
+_RICH_KEYS = ("header", "footer", "border", "title", "text", "highlight",
+              "cpu", "memory", "network", "disk", "process", "graph",
+              "progress_low", "progress_medium", "progress_high")
+
+
+@functools.lru_cache(maxsize=32)
+def _build_rich_theme(cyan, fg, cpu_box, mem_box, net_box, disk_box,
+                      proc_box, blue, green, yellow, red):
+    """Build the flat style map from a theme's colors (memoized)
+
+    Вынесено на уровень модуля: lru_cache по кортежу строк цветов, а не
+    по self, поэтому одинаковые палитры делят один словарь между
+    экземплярами ThemeLoader.
+    """
+    on_cyan = "black on " + cyan
+    values = (on_cyan, on_cyan, fg, cyan, fg, cyan, cpu_box, mem_box,
+              net_box, disk_box, proc_box, blue, green, yellow, red)
+    # Одна C-уровневая сборка словаря вместо 15-строчного литерала
+    return dict(zip(_RICH_KEYS, values))
+
+
+class ThemeLoader:
+    """Загрузчик пользовательских тем (.theme файлы в ~/.config/sysview/themes)
+
+    Темы загружаются лениво: при создании индексируются только имена
+    файлов, разбор файла происходит при первом get_theme(name) и
+    результат запоминается.
+    """
+
+    __slots__ = ('themes_dir', '_theme_paths', '_themes_cache', '_cp',
+                 '_cp_lock', '_known')
+
+    def __init__(self, themes_dir=None):
+        if themes_dir is None:
+            themes_dir = Path.home() / ".config" / "sysview" / "themes"
+        self.themes_dir = str(themes_dir)
+        # Имя темы -> (путь, mtime); кэш разобранных тем хранит mtime
+        # на момент разбора, чтобы не перечитывать неизменённые файлы
+        self._theme_paths: Dict[str, tuple] = {}
+        self._themes_cache: Dict[str, tuple] = {}
+        # Один разделяемый парсер для запасного пути: создаётся при
+        # первом использовании, между файлами чистится через clear();
+        # замок нужен только параллельной предзагрузке load_themes()
+        self._cp = None
+        self._cp_lock = threading.Lock()
+        # Замороженное множество известных имён: отрицательный ответ -
+        # одна проверка принадлежности без похода по словарям
+        self._known = frozenset()
+        self._index_themes()
+
+    def _index_themes(self):
+        """(Re)index available .theme files without parsing them
+
+        Строится заново при каждом вызове, поэтому повторный load_themes()
+        видит и добавленные, и удалённые файлы.
+        """
+        paths: Dict[str, tuple] = {}
+        # Отсутствие каталога ловим от самого scandir - без отдельного
+        # stat на os.path.exists перед ним
+        try:
+            it = os.scandir(self.themes_dir)
+        except (FileNotFoundError, NotADirectoryError):
+            it = None
+        if it is not None:
+            # scandir отдаёт DirEntry с кэшированным типом файла и готовым
+            # путём - без дополнительных stat/splitext/join на каждый файл
+            with it:
+                for entry in it:
+                    name = entry.name
+                    if not name.endswith('.theme') or not entry.is_file(follow_symlinks=False):
+                        continue
+                    # stat() у DirEntry кэширован - лишнего syscall нет
+                    paths[name[:-6]] = (entry.path, entry.stat().st_mtime_ns)
+        self._theme_paths = paths
+        self._known = frozenset(paths)
+
+    def load_themes(self):
+        """Eagerly parse every indexed theme, reading files in parallel
+
+        Ленивый путь остаётся основным; этот метод - для режима
+        предзагрузки. Разбор файлов в основном I/O-bound, поэтому пул
+        потоков даёт выигрыш; уже разобранные и неизменённые темы
+        пропускаются по mtime. Индекс перед обходом снимается заново,
+        так что повторный вызов подхватывает новые и изменённые файлы.
+        """
+        self._index_themes()
+        pending = []
+        for name, (path, mtime) in self._theme_paths.items():
+            cached = self._themes_cache.get(name)
+            if cached is not None and cached[0] == mtime:
+                continue
+            pending.append((name, path, mtime))
+        if not pending:
+            return
+
+        def _safe_load(path):
+            try:
+                return self.load_theme_file(path)
+            except (OSError, configparser.Error):
+                return None
+
+        workers = min(8, len(pending))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+            parsed_all = ex.map(_safe_load, [path for _, path, _ in pending])
+            for (name, _, mtime), parsed in zip(pending, parsed_all):
+                if parsed is not None:
+                    self._themes_cache[name] = (mtime, parsed)
+
+    def get_theme_names(self) -> List[str]:
+        """List available user theme names (no parsing involved)"""
+        return list(self._theme_paths.keys())
+
+    def has_theme(self, name: str) -> bool:
+        """Check whether a user theme with this name exists"""
+        return name in self._known
+
+    def get_theme(self, name: str) -> Optional[Dict[str, Dict[str, str]]]:
+        """Return a parsed theme, loading the file on first access"""
+        if name not in self._known:
+            return None
+        path = self._theme_paths[name][0]
+        # Свежий stat вместо mtime из индекса: иначе сравнение никогда
+        # не проваливается и правки файла не подхватываются
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._themes_cache.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            parsed = self.load_theme_file(path)
+        except (OSError, configparser.Error):
+            return None
+        self._themes_cache[name] = (mtime, parsed)
+        return parsed
+
+    def load_theme_file(self, path: str) -> Dict[str, Dict[str, str]]:
+        """Parse a .theme file into {'main': {...}, 'cpu': {...}, ...}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+
+        # split чередует заголовки секций и их тела: [преамбула, имя,
+        # тело, имя, тело, ...]
+        parts = _SECTION_RE.split(text)
+        if len(parts) < 3:
+            # Нестандартный INI (другие разделители и т.п.) - отдаём
+            # его настоящему configparser
+            return self._load_theme_configparser(path)
+        raw = {section: dict(_KV_RE.findall(body))
+               for section, body in zip(parts[1::2], parts[2::2])}
+
+        # Палитра из [theme[main]]: её имена можно использовать как
+        # значения в остальных секциях
+        colors = raw.get('theme[main]', {})
+
+        theme = {}
+        for section, items in raw.items():
+            # Обычный случай 'theme[имя]' снимается одним срезом без
+            # промежуточных строк от двух replace
+            if section.startswith('theme[') and section.endswith(']'):
+                section_name = section[6:-1]
+            else:
+                section_name = section.replace('theme[', '').replace(']', '')
+            theme[section_name] = {}
+            for key, value in items.items():
+                # Имя из палитры разворачивается в его цвет; строка
+                # цвета заменяется общим каноническим экземпляром
+                theme[section_name][key] = _canon_color(colors.get(value, value))
+        return theme
+
+    def _load_theme_configparser(self, path: str) -> Dict[str, Dict[str, str]]:
+        """Fallback parser for files the fast regex path cannot handle"""
+        with self._cp_lock:
+            config = self._cp
+            if config is None:
+                # interpolation=None убирает разбор %-подстановок, пустое
+                # имя default-секции - слияние DEFAULT при каждом доступе
+                config = self._cp = configparser.ConfigParser(
+                    interpolation=None, delimiters=('=',), default_section='')
+            else:
+                config.clear()
+            config.read(path, encoding='utf-8')
+
+            # Сырые секции без интерполяции и слияния DEFAULT - один
+            # проход вместо двух обходов через config[section].items()
+            raw_sections = config._sections
+            colors_get = raw_sections.get('theme[main]', {}).get
+
+            theme = {}
+            for section, items in raw_sections.items():
+                if section.startswith('theme[') and section.endswith(']'):
+                    section_name = section[6:-1]
+                else:
+                    section_name = section.replace('theme[', '').replace(']', '')
+                theme[section_name] = {key: _canon_color(colors_get(value, value))
+                                       for key, value in items.items()}
+            return theme
+
+    def convert_to_rich_theme(self, theme: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+        """Convert a parsed theme into the flat style map THEMES uses"""
+        # Каждая секция ищется в словаре один раз; main может
+        # отсутствовать так же, как и любая другая секция
+        get = theme.get
+        empty = {}
+        main = get('main', empty)
+        return _build_rich_theme(
+            main.get('cyan', '#88c0d0'),
+            main.get('foreground', '#d8dee9'),
+            get('cpu', empty).get('box', '#5e81ac'),
+            get('mem', empty).get('box', '#b48ead'),
+            get('net', empty).get('box', '#a3be8c'),
+            get('disk', empty).get('box', '#ebcb8b'),
+            get('proc', empty).get('box', '#88c0d0'),
+            main.get('blue', '#81a1c1'),
+            main.get('green', '#a3be8c'),
+            main.get('yellow', '#ebcb8b'),
+            main.get('red', '#bf616a')
+        )
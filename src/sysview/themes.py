@@ -1,75 +1,37 @@
 """
 Color themes for sysview
 """
-from typing import Dict
+import sys
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
-THEMES: Dict[str, Dict[str, str]] = {
-    "default": {
-        "header": "white on blue",
-        "footer": "white on blue",
-        "border": "white",
-        "title": "white",
-        "text": "white",
-        "highlight": "cyan",
-        "cpu": "blue",
-        "memory": "magenta",
-        "network": "green",
-        "disk": "yellow",
-        "process": "cyan",
-        "graph": "blue",
-        "progress_low": "green",
-        "progress_medium": "yellow",
-        "progress_high": "red"
-    },
-    "nord": {
-        "header": "black on cyan",
-        "footer": "black on cyan",
-        "border": "#81A1C1",  # Nord Frost
-        "title": "#88C0D0",   # Nord Frost
-        "text": "#D8DEE9",    # Nord Snow
-        "highlight": "#81A1C1",# Nord Frost
-        "cpu": "#5E81AC",     # Nord Frost
-        "memory": "#B48EAD",  # Nord Purple
-        "network": "#A3BE8C", # Nord Green
-        "disk": "#EBCB8B",    # Nord Yellow
-        "process": "#88C0D0", # Nord Frost
-        "graph": "#81A1C1",   # Nord Frost
-        "progress_low": "#A3BE8C",    # Nord Green
-        "progress_medium": "#EBCB8B",  # Nord Yellow
-        "progress_high": "#BF616A"     # Nord Red
-    },
-    "dracula": {
-        "header": "white on purple",
-        "footer": "white on purple",
-        "border": "#BD93F9",  # Purple
-        "title": "#FF79C6",   # Pink
-        "text": "#F8F8F2",    # Foreground
-        "highlight": "#8BE9FD",# Cyan
-        "cpu": "#BD93F9",     # Purple
-        "memory": "#FF79C6",  # Pink
-        "network": "#50FA7B", # Green
-        "disk": "#F1FA8C",   # Yellow
-        "process": "#8BE9FD", # Cyan
-        "graph": "#BD93F9",   # Purple
-        "progress_low": "#50FA7B",    # Green
-        "progress_medium": "#FFB86C",  # Orange
-        "progress_high": "#FF5555"     # Red
-    },
-    "gruvbox": {
-        "header": "black on yellow",
-        "footer": "black on yellow",
-        "border": "#928374",  # Gray
-        "title": "#b8bb26",   # Green
-        "text": "#ebdbb2",    # Light
-        "highlight": "#83a598",# Blue
-        "cpu": "#458588",     # Blue
-        "memory": "#b16286",  # Purple
-        "network": "#98971a", # Green
-        "disk": "#d79921",   # Yellow
-        "process": "#83a598", # Blue
-        "graph": "#928374",   # Gray
-        "progress_low": "#98971a",    # Green
-        "progress_medium": "#d79921",  # Yellow
-        "progress_high": "#cc241d"     # Red
-    }
-} 
\ No newline at end of file
+# Канонические экземпляры строк цветов: один и тот же hex в разных
+# темах делит один PyUnicode-объект
+_CANON: Dict[str, str] = {}
+
+def _canon_color(s: str) -> str:
+    """Return the shared interned instance of a color string"""
+    return _CANON.setdefault(s, sys.intern(s))
+
+_cached_themes: Optional[Mapping[str, Mapping[str, str]]] = None
+
+def get_themes() -> Mapping[str, Mapping[str, str]]:
+    """Built-in themes, parsed from themes.json on first access
+
+    Словари тем больше не строятся на импорте модуля: themes.json
+    читается при первом обращении и кэшируется. Представление то же,
+    что и раньше: заморожено через MappingProxyType, ключи стилей
+    интернированы, строки цветов канонизированы.
+    """
+    global _cached_themes
+    if _cached_themes is None:
+        import json
+        import importlib.resources
+        raw = json.loads(importlib.resources.files(__package__)
+                         .joinpath('themes.json').read_text(encoding='utf-8'))
+        _cached_themes = MappingProxyType({
+            name: MappingProxyType({sys.intern(key): _canon_color(value)
+                                    for key, value in theme.items()})
+            for name, theme in raw.items()
+        })
+    return _cached_themes